@@ -1,12 +1,20 @@
 from __future__ import annotations
 import asyncio
+import contextlib
+import copy
 import hashlib
+import queue
+import re
 import threading
+import time
+import weakref
 from concurrent.futures import ThreadPoolExecutor
 from dataclasses import replace
 from datetime import datetime, timedelta
-from functools import partial
-from typing import Any, Callable, Dict, List, Optional
+from functools import lru_cache, partial
+from itertools import islice
+from types import SimpleNamespace
+from typing import Any, Awaitable, Callable, Dict, List, Optional
 
 import voluptuous as vol
 
@@ -21,72 +29,130 @@ from custom_components.aurora_llm_assistant.tools.core.schema_manager import (
 )
 
 DEFAULT_TREND_RANGE_DAYS = 30
+DEFAULT_TREND_RANGE = timedelta(days=DEFAULT_TREND_RANGE_DAYS)
 MIN_ALLOWED_AGE = 1
 MAX_ALLOWED_AGE = 150
+MIN_WISH_LENGTH = 3
+MAX_WISH_LENGTH = 280
+_WHITESPACE_RE = re.compile(r"\s+")
+TRENDING_CACHE_TTL_SECONDS = 60.0
+RECENT_WISHES_LIMIT = 5
+LIST_WISHES_LIMIT = 100
+LIST_PREVIEW_LIMIT = 10
+CONNECTION_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA busy_timeout=5000",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-20000",
+    "PRAGMA mmap_size=268435456",
+)
+READER_POOL_SIZE = 2
+# SQLite builds older than 3.25 reject ``OVER ()`` with one of these errors.
+WINDOW_FUNCTION_ERRORS = ("no such function", "syntax error")
 
 
-@register_schema("santa_wishlist")
-class SantaWishlistSchema(BaseSchema):
-    """Centralized schema describing the Santa wishlist actions."""
+@lru_cache(maxsize=1024)
+def _compute_child_hash(name_lower: str, age: Optional[int], entry_id: str) -> str:
+    base = f"{name_lower}|{age if age is not None else ''}|{entry_id}"
+    return hashlib.sha256(base.encode("utf-8")).hexdigest()
+
+
+@lru_cache(maxsize=1024)
+def _normalize_name_cached(name: str) -> str:
+    return _WHITESPACE_RE.sub(" ", name).strip().title()
+
+
+@lru_cache(maxsize=8)
+def _utc_iso_for_second(epoch_second: int) -> str:
+    return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(epoch_second))
+
+
+def _validate_wish(value: Any) -> str:
+    if not isinstance(value, str):
+        raise vol.Invalid("expected str")
+    if not MIN_WISH_LENGTH <= len(value) <= MAX_WISH_LENGTH:
+        raise vol.Invalid(
+            f"length of value must be between {MIN_WISH_LENGTH} and {MAX_WISH_LENGTH}"
+        )
+    return value
 
-    def __init__(self) -> None:
-        super().__init__()
 
-        action_field = replace(CommonFieldSpecs.ACTION)
-        action_options = [
+_ACTION_FIELD = replace(
+    CommonFieldSpecs.ACTION,
+    widget_options={
+        **CommonFieldSpecs.ACTION.widget_options,
+        "trigger_update": True,
+        "options": [
             {"value": "register", "label": "register"},
             {"value": "list", "label": "list"},
             {"value": "trending", "label": "trending"},
-        ]
-        widget_options = dict(action_field.widget_options)
-        widget_options["trigger_update"] = True
-        widget_options["options"] = action_options
-        action_field.widget_options = widget_options
-
-        self.register_field("action", action_field)
-        self.register_field("name", CommonFieldSpecs.NAME)
-        self.register_field("age", CommonFieldSpecs.AGE)
-        self.register_field(
-            "wish",
-            FieldSpec(
-                type=str,
-                description="Christmas wish to register",
-                widget="textarea",
-                validation=vol.All(str, vol.Length(min=3, max=280)),
-            ),
-        )
+        ],
+    },
+)
 
-        self.register_action(
-            "register",
-            ActionSpec(
-                required=["action", "name", "wish"],
-                optional=["age"],
-                hidden=[],
-                description="Register a new Christmas wish",
-            ),
-        )
+_SCHEMA_FIELDS = (
+    ("action", _ACTION_FIELD),
+    ("name", CommonFieldSpecs.NAME),
+    ("age", CommonFieldSpecs.AGE),
+    (
+        "wish",
+        FieldSpec(
+            type=str,
+            description="Christmas wish to register",
+            widget="textarea",
+            validation=_validate_wish,
+        ),
+    ),
+)
 
-        self.register_action(
-            "list",
-            ActionSpec(
-                required=["action", "name", "age"],
-                optional=[],
-                hidden=["wish"],
-                description="Show all wishes saved for a specific person",
-            ),
-        )
+_SCHEMA_ACTIONS = (
+    (
+        "register",
+        ActionSpec(
+            required=["action", "name", "wish"],
+            optional=["age"],
+            hidden=[],
+            description="Register a new Christmas wish",
+        ),
+    ),
+    (
+        "list",
+        ActionSpec(
+            required=["action", "name", "age"],
+            optional=[],
+            hidden=["wish"],
+            description="Show all wishes saved for a specific person",
+        ),
+    ),
+    (
+        "trending",
+        ActionSpec(
+            required=["action"],
+            optional=[],
+            hidden=["name", "age", "wish"],
+            description="Show trending wishes registered with Santa",
+        ),
+    ),
+)
+
+SCHEMA_FRIENDLY_NAME = "Tomtens önskelista"
 
-        self.register_action(
-            "trending",
-            ActionSpec(
-                required=["action"],
-                optional=[],
-                hidden=["name", "age", "wish"],
-                description="Show trending wishes registered with Santa",
-            ),
-        )
 
-        self.set_friendly_name("Tomtens önskelista")
+@register_schema("santa_wishlist")
+class SantaWishlistSchema(BaseSchema):
+    """Centralized schema describing the Santa wishlist actions."""
+
+    def __init__(self) -> None:
+        super().__init__()
+
+        for field_name, spec in _SCHEMA_FIELDS:
+            self.register_field(field_name, spec)
+
+        for action_name, spec in _SCHEMA_ACTIONS:
+            self.register_action(action_name, spec)
+
+        self.set_friendly_name(SCHEMA_FRIENDLY_NAME)
 
 
 class SantaWishlist(SimpleBaseTool):
@@ -101,22 +167,63 @@ class SantaWishlist(SimpleBaseTool):
 
     def __init__(self, hass, config: Optional[Dict[str, Any]] = None) -> None:
         self._connection = None
-        self._connection_thread_id: Optional[int] = None
-        self._tables_ready = False
+        self._conn_ready = False
         self._connection_lock = asyncio.Lock()
-        self._db_task_lock = asyncio.Lock()
-        self._db_executor: Optional[ThreadPoolExecutor] = None
+        self._write_lock = asyncio.Lock()
+        self._db_executor, self._reader_executor = self._create_executors()
+        self._reader_connections: Optional[queue.SimpleQueue] = None
+        self._reader_pool_lock = threading.Lock()
+        self._cross_thread_connections = False
+        self._handlers: Dict[str, Callable[..., Awaitable[Dict[str, Any]]]] = {
+            "register": self._register_wish,
+            "list": self._list_wishes,
+            "trending": self._get_trending_wishes,
+        }
+        self._window_functions_supported = True
+        self._trending_cache: Optional[tuple[float, Dict[str, Any]]] = None
+        self._trending_generation = 0
+        self._trending_lock = asyncio.Lock()
         self._fallback_entry_id: Optional[str] = None
         self._entry_id_warning_emitted = False
+        self._locale: Optional[str] = None
+        self._table_wishlist = self._table_name("wishlist_entries")
+        self._table_children = self._table_name("children")
+        self._sql = self._build_sql(self._table_wishlist)
         super().__init__(hass, config)
+        # _ensure_entry_id normalises a missing or non-dict config on first use.
+        initial_config = self.config if isinstance(self.config, dict) else {}
+        self._entry_id = str(initial_config.get("entry_id", ""))
 
     def on_unload(self) -> None:
         self._connection = None
-        self._connection_thread_id = None
-        self._tables_ready = False
-        if self._db_executor:
-            self._db_executor.shutdown(wait=False)
-            self._db_executor = None
+        self._conn_ready = False
+        self._trending_cache = None
+        _compute_child_hash.cache_clear()
+        _normalize_name_cached.cache_clear()
+        with self._reader_pool_lock:
+            readers, self._reader_connections = self._reader_connections, None
+        if readers is not None:
+            self._close_reader_connections(readers)
+        for finalizer in self._executor_finalizers:
+            finalizer()
+        self._db_executor, self._reader_executor = self._create_executors()
+
+    def _create_executors(self) -> tuple[ThreadPoolExecutor, ThreadPoolExecutor]:
+        """Create the writer and reader executors; worker threads start on first submit.
+
+        The finalizers shut the executors down if the tool is collected without
+        being unloaded; ``on_unload`` calls them so retired executors are released.
+        """
+
+        writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"{self.name}_db")
+        reader = ThreadPoolExecutor(
+            max_workers=READER_POOL_SIZE, thread_name_prefix=f"{self.name}_db_read"
+        )
+        self._executor_finalizers = (
+            weakref.finalize(self, writer.shutdown, False),
+            weakref.finalize(self, reader.shutdown, False),
+        )
+        return writer, reader
 
     def get_database_connection(self):
         """Return a SQLite connection that allows cross-thread usage."""
@@ -129,8 +236,10 @@ class SantaWishlist(SimpleBaseTool):
                 self.config,
                 check_same_thread=False,
             )
+            self._cross_thread_connections = True
         except TypeError:
             connection = get_connection(self.name, self.config)
+            self._cross_thread_connections = False
             self._logger.debug(
                 "DatabaseManager.get_connection does not support the check_same_thread "
                 "override; falling back to default behaviour"
@@ -147,27 +256,33 @@ class SantaWishlist(SimpleBaseTool):
     ) -> Dict[str, Any]:
         action = (action or "register").strip().lower()
 
-        if action == "register":
-            return await self._register_wish(name, wish, age)
-        if action == "list":
-            return await self._list_wishes(name, age)
-        if action == "trending":
-            return await self._get_trending_wishes()
+        handler = self._handlers.get(action)
+        if handler is None:
+            return {
+                "status": "error",
+                "message": self._message(
+                    "unknown_action",
+                    f"Unknown action '{action}'. Available actions: {', '.join(self._handlers)}.",
+                    action=action,
+                ),
+            }
 
-        return {
-            "status": "error",
-            "message": self._message(
-                "unknown_action",
-                f"Unknown action '{action}'. Available actions: register, list, trending.",
-                action=action,
-            ),
-        }
+        if not await self._ensure_connection():
+            return {
+                "status": "error",
+                "message": self._message(
+                    "ledger_unavailable",
+                    "Santa's ledger is unavailable right now. Please try again later.",
+                ),
+            }
+
+        return await handler(name, age, wish)
 
     async def _register_wish(
         self,
         name: Optional[str],
-        wish: Optional[str],
         age: Optional[int],
+        wish: Optional[str],
     ) -> Dict[str, Any]:
         normalized_name = self._normalize_name(name)
         if not normalized_name:
@@ -188,7 +303,7 @@ class SantaWishlist(SimpleBaseTool):
                     "A wish is required to register with Santa.",
                 ),
             }
-        if len(sanitized_wish) < 3:
+        if len(sanitized_wish) < MIN_WISH_LENGTH:
             return {
                 "status": "error",
                 "message": self._message(
@@ -201,25 +316,10 @@ class SantaWishlist(SimpleBaseTool):
         if age_error:
             return {"status": "error", "message": age_error}
 
-        connection = await self._ensure_connection()
-        if not connection:
-            return {
-                "status": "error",
-                "message": self._message(
-                    "ledger_unavailable",
-                    "Santa's ledger is unavailable right now. Please try again later.",
-                ),
-            }
-
         child_hash = self._child_hash(normalized_name, validated_age)
         created_at = self._utc_now_iso()
-        entry_id = str(self.config.get("entry_id", ""))
+        entry_id = self._entry_id
 
-        table = self._table_name("wishlist_entries")
-        insert_sql = (
-            f"INSERT INTO {table} (child_hash, child_name, age, wish, created_at, entry_id, locale) "
-            "VALUES (?, ?, ?, ?, ?, ?, ?)"
-        )
         params = [
             child_hash,
             normalized_name,
@@ -231,11 +331,9 @@ class SantaWishlist(SimpleBaseTool):
         ]
 
         try:
-            result = await self._run_db_task(
-                self._execute_query_sync,
-                insert_sql,
-                params,
-            )
+            async with self._write_lock:
+                result = await self._run_db_task(self._register_wish_tx_sync, params)
+                self._invalidate_trending_cache()
         except DatabaseError as error:
             self._logger.error("Failed to register wish: %s", error)
             self.event_manager.plugin_error(self.name, str(error), "register_wish")
@@ -247,20 +345,10 @@ class SantaWishlist(SimpleBaseTool):
                 ),
             }
 
-        wish_id = result.get("lastrowid") if isinstance(result, dict) else None
-
-        total_result = await self._select(
-            f"SELECT COUNT(*) FROM {table} WHERE child_hash = ?",
-            [child_hash],
-        )
-        total_for_child = int(total_result[0][0]) if total_result else 1
-
-        recent_rows = await self._select(
-            f"SELECT wish, created_at FROM {table} WHERE child_hash = ? ORDER BY created_at DESC LIMIT 5",
-            [child_hash],
-        )
+        wish_id = result["wish_id"]
+        total_for_child = result["total"] or 1
         recent_wishes = [
-            {"wish": row[0], "created_at": row[1]} for row in recent_rows
+            {"wish": row[0], "created_at": row[1]} for row in result["recent"]
         ]
 
         self.event_manager.wish_registered(
@@ -288,7 +376,12 @@ class SantaWishlist(SimpleBaseTool):
             "recent_wishes": recent_wishes,
         }
 
-    async def _list_wishes(self, name: Optional[str], age: Optional[int]) -> Dict[str, Any]:
+    async def _list_wishes(
+        self,
+        name: Optional[str],
+        age: Optional[int],
+        _wish: Optional[str] = None,
+    ) -> Dict[str, Any]:
         normalized_name = self._normalize_name(name)
         validated_age, age_error = self._validate_age(age, required=True)
 
@@ -303,23 +396,20 @@ class SantaWishlist(SimpleBaseTool):
         if age_error:
             return {"status": "error", "message": age_error}
 
-        connection = await self._ensure_connection()
-        if not connection:
+        child_hash = self._child_hash(normalized_name, validated_age)
+        try:
+            total, rows = await self._select_child_wishes(child_hash, LIST_WISHES_LIMIT)
+        except DatabaseError as error:
+            self._logger.error("Failed to list wishes: %s", error)
+            self.event_manager.plugin_error(self.name, str(error), "list")
             return {
                 "status": "error",
                 "message": self._message(
                     "ledger_unavailable",
-                    "Santa's ledger is unavailable right now. Please try again later.",
+                    "Could not read the wishes due to a database error. Please try again later.",
                 ),
             }
 
-        child_hash = self._child_hash(normalized_name, validated_age)
-        table = self._table_name("wishlist_entries")
-        rows = await self._select(
-            f"SELECT wish, created_at FROM {table} WHERE child_hash = ? ORDER BY created_at DESC",
-            [child_hash],
-        )
-
         if not rows:
             return {
                 "status": "success",
@@ -330,22 +420,14 @@ class SantaWishlist(SimpleBaseTool):
                 "wishes": [],
             }
 
-        wishes = [
-            {
-                "wish": row[0],
-                "created_at": row[1],
-            }
-            for row in rows
-        ]
-
-        lines = [
-            f"{index + 1}. {entry['wish']} (added {self._humanize_timestamp(entry['created_at'])})"
-            for index, entry in enumerate(wishes[:10])
-        ]
-        preview = "\n".join(lines)
+        wishes = [{"wish": row[0], "created_at": row[1]} for row in rows]
+        preview = "\n".join(
+            f"{index}. {row[0]} (added {self._humanize_timestamp(row[1])})"
+            for index, row in enumerate(islice(rows, LIST_PREVIEW_LIMIT), start=1)
+        )
 
         message = (
-            f"{self._format_child_name(normalized_name, validated_age)} has {len(wishes)} wishes saved."
+            f"{self._format_child_name(normalized_name, validated_age)} has {total} wishes saved."
             f"\n{preview}"
         )
 
@@ -353,37 +435,63 @@ class SantaWishlist(SimpleBaseTool):
             "status": "success",
             "message": message,
             "wishes": wishes,
-            "total": len(wishes),
+            "total": total,
         }
 
-    async def _get_trending_wishes(self) -> Dict[str, Any]:
-        connection = await self._ensure_connection()
-        if not connection:
+    async def _get_trending_wishes(
+        self,
+        _name: Optional[str] = None,
+        _age: Optional[int] = None,
+        _wish: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        cached = self._cached_trending()
+        if cached is not None:
+            return cached
+
+        async with self._trending_lock:
+            cached = self._cached_trending()
+            if cached is not None:
+                return cached
+
+            generation = self._trending_generation
+            result = await self._load_trending_wishes()
+            if result["status"] == "success" and generation == self._trending_generation:
+                self._trending_cache = (time.monotonic(), copy.deepcopy(result))
+            return result
+
+    def _cached_trending(self) -> Optional[Dict[str, Any]]:
+        if self._trending_cache is None:
+            return None
+
+        cached_at, payload = self._trending_cache
+        if time.monotonic() - cached_at >= TRENDING_CACHE_TTL_SECONDS:
+            self._trending_cache = None
+            return None
+
+        return copy.deepcopy(payload)
+
+    def _invalidate_trending_cache(self) -> None:
+        self._trending_cache = None
+        self._trending_generation += 1
+
+    async def _load_trending_wishes(self) -> Dict[str, Any]:
+        since = self._utc_iso_ago(DEFAULT_TREND_RANGE)
+
+        try:
+            trending_rows = await self._select(self._sql.trending, [since])
+        except DatabaseError as error:
+            self._logger.error("Failed to load trending wishes: %s", error)
+            self.event_manager.plugin_error(self.name, str(error), "trending")
             return {
                 "status": "error",
                 "message": self._message(
                     "ledger_unavailable",
-                    "Santa's analytics are offline right now. Please try again later.",
+                    "Could not load trending wishes due to a database error. Please try again later.",
                 ),
             }
 
-        table = self._table_name("wishlist_entries")
-        since = self._utc_iso_days_ago(DEFAULT_TREND_RANGE_DAYS)
-
-        trending_rows = await self._select(
-            (
-                f"SELECT wish, COUNT(*) AS total, MAX(created_at) AS last_seen "
-                f"FROM {table} WHERE created_at >= ? GROUP BY wish ORDER BY total DESC, last_seen DESC LIMIT 5"
-            ),
-            [since],
-        )
-
-        totals = await self._select(
-            f"SELECT COUNT(*), COUNT(DISTINCT child_hash) FROM {table} WHERE created_at >= ?",
-            [since],
-        )
-        total_wishes = int(totals[0][0]) if totals else 0
-        unique_children = int(totals[0][1]) if totals else 0
+        total_wishes = int(trending_rows[0][3]) if trending_rows else 0
+        unique_children = int(trending_rows[0][4]) if trending_rows else 0
 
         if not trending_rows:
             return {
@@ -417,15 +525,11 @@ class SantaWishlist(SimpleBaseTool):
         }
 
     async def _ensure_connection(self):
-        if (
-            self._connection
-            and self._tables_ready
-            and self._connection_thread_id == threading.get_ident()
-        ):
+        if self._conn_ready:
             return self._connection
 
         async with self._connection_lock:
-            if self._connection and self._tables_ready:
+            if self._conn_ready:
                 return self._connection
 
             self._ensure_entry_id()
@@ -439,88 +543,286 @@ class SantaWishlist(SimpleBaseTool):
 
             return connection
 
-    async def _select(self, query: str, params: Optional[List[Any]] = None) -> List[List[Any]]:
-        connection = await self._ensure_connection()
-        if not connection:
-            return []
-
-        try:
-            result = await self._run_db_task(
-                self._execute_query_sync,
-                query,
-                params or [],
-            )
-        except DatabaseError as error:
-            self._logger.error("Database query failed: %s", error)
-            self.event_manager.plugin_error(self.name, str(error), "select")
-            return []
-
+    async def _select(
+        self,
+        query: str,
+        params: Optional[List[Any]] = None,
+    ) -> List[List[Any]]:
+        result = await self._run_read(self._query_sync, query, params or [])
         return result.get("data", []) if isinstance(result, dict) else []
 
+    async def _select_child_wishes(
+        self, child_hash: str, limit: int
+    ) -> tuple[int, List[List[Any]]]:
+        return await self._run_read(self._select_child_wishes_sync, child_hash, limit)
+
     async def _run_db_task(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
-        async with self._db_task_lock:
-            if not self._db_executor:
-                self._db_executor = ThreadPoolExecutor(
-                    max_workers=1, thread_name_prefix=f"{self.name}_db"
-                )
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._db_executor,
+            partial(func, *args, **kwargs),
+        )
 
-            loop = asyncio.get_running_loop()
-            return await loop.run_in_executor(
-                self._db_executor,
-                partial(func, *args, **kwargs),
-            )
+    async def _run_read(self, func: Callable[..., Any], *args: Any) -> Any:
+        """Run ``func(*args, connection=...)`` on a pooled reader connection.
+
+        Falls back to the writer thread when the database manager hands out a
+        single shared connection, since that handle must not be used concurrently.
+        """
+
+        readers = self._reader_connections
+        if readers is None:
+            return await self._run_db_task(self._run_on_writer_sync, func, *args)
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._reader_executor,
+            partial(self._run_on_reader_sync, readers, func, *args),
+        )
+
+    def _run_on_writer_sync(self, func: Callable[..., Any], *args: Any) -> Any:
+        return func(*args, connection=self._get_or_create_connection_sync())
+
+    def _run_on_reader_sync(
+        self, readers: queue.SimpleQueue, func: Callable[..., Any], *args: Any
+    ) -> Any:
+        """Borrow a connection from ``readers``; once ``on_unload`` retired that pool, close it instead."""
+
+        with self._reader_pool_lock:
+            if readers is not self._reader_connections:
+                raise DatabaseError("Reader connections were closed during unload")
+            # The pool holds one connection per reader thread, so one is always free.
+            connection = readers.get_nowait()
+        try:
+            return func(*args, connection=connection)
+        finally:
+            with self._reader_pool_lock:
+                retired = readers is not self._reader_connections
+                if not retired:
+                    readers.put(connection)
+            if retired:
+                self._close_connection(connection)
+
+    def _open_reader_pool_sync(self, writer) -> Optional[queue.SimpleQueue]:
+        """Open dedicated reader connections so WAL reads do not wait on the writer.
+
+        Readers are opened here on the writer thread but used on the reader
+        executor's threads, so the pool is only built when the database manager
+        honoured the ``check_same_thread=False`` override.
+        """
+
+        if not self._cross_thread_connections:
+            return None
+
+        readers: queue.SimpleQueue = queue.SimpleQueue()
+        for _ in range(READER_POOL_SIZE):
+            try:
+                connection = self.get_database_connection()
+            except DatabaseError as error:
+                self._logger.debug("Could not open reader connection: %s", error)
+                self._close_reader_connections(readers)
+                return None
+            if connection is writer:
+                self._close_reader_connections(readers)
+                return None
+            self._apply_pragmas_sync(connection)
+            readers.put(connection)
+        return readers
+
+    def _close_reader_connections(self, readers: queue.SimpleQueue) -> None:
+        while True:
+            try:
+                connection = readers.get_nowait()
+            except queue.Empty:
+                return
+            self._close_connection(connection)
+
+    def _close_connection(self, connection) -> None:
+        close = getattr(connection, "close", None)
+        if close is None:
+            return
+        try:
+            close()
+        except Exception as error:  # pragma: no cover - best effort cleanup
+            self._logger.debug("Could not close reader connection: %s", error)
 
     def _get_or_create_connection_sync(self):
-        if self._connection and self._tables_ready:
+        if self._conn_ready:
             return self._connection
 
-        if hasattr(self, "get_database_connection"):
-            connection = self.get_database_connection()
-        else:
-            connection = self.database_manager.get_connection(self.name, self.config)
-
-        current_thread = threading.get_ident()
+        connection = self.get_database_connection()
 
-        if self._connection_thread_id != current_thread:
-            self._tables_ready = False
-            self._connection = None
+        self._apply_pragmas_sync(connection)
 
-        if not self._tables_ready:
-            schema = {
-                "id": "INTEGER PRIMARY KEY AUTOINCREMENT",
-                "child_hash": "TEXT NOT NULL",
+        connection.create_table(
+            "children",
+            {
+                "child_hash": "TEXT PRIMARY KEY",
                 "child_name": "TEXT NOT NULL",
                 "age": "INTEGER",
-                "wish": "TEXT NOT NULL",
-                "created_at": "TEXT NOT NULL",
-                "entry_id": "TEXT",
                 "locale": "TEXT",
-            }
-            connection.create_table(
-                "wishlist_entries",
-                schema,
-            )
+                "entry_id": "TEXT",
+            },
+        )
 
-            index_hash = (
-                f"CREATE INDEX IF NOT EXISTS idx_{self.name}_child_hash ON "
-                f"{self._table_name('wishlist_entries')} (child_hash)"
-            )
-            index_wish = (
-                f"CREATE INDEX IF NOT EXISTS idx_{self.name}_wish ON "
-                f"{self._table_name('wishlist_entries')} (wish)"
-            )
-            connection.execute_query(index_hash, [])
-            connection.execute_query(index_wish, [])
-            self._tables_ready = True
+        schema = {
+            "id": "INTEGER PRIMARY KEY AUTOINCREMENT",
+            "child_hash": f"TEXT NOT NULL REFERENCES {self._table_children} (child_hash)",
+            "wish": "TEXT NOT NULL",
+            "created_at": "TEXT NOT NULL",
+        }
+        self._migrate_legacy_entries_sync(connection, schema)
+        connection.create_table(
+            "wishlist_entries",
+            schema,
+        )
 
-        self._connection_thread_id = current_thread
+        executescript = getattr(connection, "executescript", None)
+        if executescript:
+            executescript(";\n".join(self._sql.index_ddl) + ";")
+        else:
+            for index_sql in self._sql.index_ddl:
+                connection.execute_query(index_sql, [])
+        self._reader_connections = self._open_reader_pool_sync(connection)
 
         self._connection = connection
+        self._conn_ready = True
         return self._connection
 
-    def _execute_query_sync(self, query: str, params: Optional[List[Any]] = None):
+    def _migrate_legacy_entries_sync(self, connection, schema: Dict[str, str]) -> None:
+        """Move per-child columns out of wishlist rows created before the children table.
+
+        The legacy table is renamed aside first and dropped last, and every copy
+        step is idempotent, so a migration interrupted on a connection that
+        auto-commits each statement resumes on the next start.
+        """
+
+        table = self._table_wishlist
+        legacy_table = f"{table}_legacy"
+        if "child_name" in self._table_columns_sync(connection, table):
+            self._logger.info("Migrating %s to the children table layout", table)
+            connection.execute_query(f"ALTER TABLE {table} RENAME TO {legacy_table}", [])
+        elif not self._table_columns_sync(connection, legacy_table):
+            return
+        else:
+            self._logger.info("Resuming interrupted migration of %s", table)
+
+        column_sql = ", ".join(f"{column} {definition}" for column, definition in schema.items())
+        statements = [
+            (
+                f"INSERT OR IGNORE INTO {self._table_children} "
+                "(child_hash, child_name, age, locale, entry_id) "
+                f"SELECT child_hash, child_name, age, locale, entry_id FROM {legacy_table} ORDER BY id"
+            ),
+            f"CREATE TABLE IF NOT EXISTS {table} ({column_sql})",
+            (
+                f"INSERT OR IGNORE INTO {table} (id, child_hash, wish, created_at) "
+                f"SELECT id, child_hash, wish, created_at FROM {legacy_table}"
+            ),
+            f"DROP TABLE {legacy_table}",
+        ]
+
+        with self._transaction_sync(connection):
+            for statement in statements:
+                connection.execute_query(statement, [])
+
+    @staticmethod
+    def _table_columns_sync(connection, table: str) -> set:
+        result = connection.execute_query(f"PRAGMA table_info({table})", [])
+        return {row[1] for row in result.get("data", [])} if isinstance(result, dict) else set()
+
+    def _register_wish_tx_sync(self, params: List[Any]) -> Dict[str, Any]:
+        """Insert a wish and read back the child's totals inside one transaction."""
+
         connection = self._get_or_create_connection_sync()
-        return connection.execute_query(query, params or [])
+        child_row, entry_row = self._split_wish_params(params)
+        with self._transaction_sync(connection):
+            connection.execute_query(self._sql.insert_child, child_row)
+            result = connection.execute_query(self._sql.insert, entry_row)
+            total, recent = self._select_child_wishes_sync(
+                child_row[0], RECENT_WISHES_LIMIT, connection
+            )
+
+        return {
+            "wish_id": result.get("lastrowid") if isinstance(result, dict) else None,
+            "total": total,
+            "recent": recent,
+        }
+
+    def _select_child_wishes_sync(
+        self, child_hash: str, limit: int, connection: Any = None
+    ) -> tuple[int, List[List[Any]]]:
+        """Return the child's wish count and newest ``limit`` wishes."""
+
+        if connection is None:
+            connection = self._get_or_create_connection_sync()
+
+        if self._window_functions_supported:
+            try:
+                result = connection.execute_query(self._sql.child_wishes, [child_hash, limit])
+            except DatabaseError as error:
+                if not any(marker in str(error).lower() for marker in WINDOW_FUNCTION_ERRORS):
+                    raise
+                self._logger.debug(
+                    "Window functions unavailable, falling back to separate queries: %s",
+                    error,
+                )
+                self._window_functions_supported = False
+            else:
+                rows = result.get("data", []) if isinstance(result, dict) else []
+                total = int(rows[0][2]) if rows else 0
+                return total, rows
+
+        total_result = connection.execute_query(self._sql.child_count, [child_hash])
+        total_rows = total_result.get("data", []) if isinstance(total_result, dict) else []
+        total = int(total_rows[0][0]) if total_rows else 0
+
+        result = connection.execute_query(self._sql.child_recent, [child_hash, limit])
+        rows = result.get("data", []) if isinstance(result, dict) else []
+        return total, rows
+
+    @contextlib.contextmanager
+    def _transaction_sync(self, connection):
+        """Group statements in one transaction.
+
+        Database managers that auto-commit after every statement close the
+        transaction early; the statements are then already stored, so a
+        rejected ``COMMIT`` is not treated as a failure.
+        """
+
+        connection.execute_query("BEGIN IMMEDIATE", [])
+        try:
+            yield
+        except Exception:
+            try:
+                connection.execute_query("ROLLBACK", [])
+            except DatabaseError as rollback_error:
+                self._logger.debug("Could not roll back transaction: %s", rollback_error)
+            raise
+        try:
+            connection.execute_query("COMMIT", [])
+        except DatabaseError as error:
+            if "no transaction is active" not in str(error).lower():
+                raise
+            self._logger.debug("Transaction was already committed by the connection")
+
+    @staticmethod
+    def _split_wish_params(params) -> tuple[List[Any], List[Any]]:
+        child_hash, child_name, age, wish, created_at, entry_id, locale = params
+        return [child_hash, child_name, age, locale, entry_id], [child_hash, wish, created_at]
+
+    def _apply_pragmas_sync(self, connection) -> None:
+        """Switch the ledger to WAL so list/trending reads do not block on writes."""
+
+        for pragma in CONNECTION_PRAGMAS:
+            try:
+                connection.execute_query(pragma, [])
+            except DatabaseError as error:
+                self._logger.debug("Could not apply '%s': %s", pragma, error)
+
+    @staticmethod
+    def _query_sync(query: str, params: List[Any], connection: Any):
+        return connection.execute_query(query, params)
 
     def _ensure_entry_id(self) -> str:
         config: Dict[str, Any]
@@ -539,6 +841,7 @@ class SantaWishlist(SimpleBaseTool):
 
         entry_id = str(config.get("entry_id", "")).strip()
         if entry_id:
+            self._entry_id = str(config.get("entry_id", ""))
             return entry_id
 
         if not self._fallback_entry_id:
@@ -547,6 +850,7 @@ class SantaWishlist(SimpleBaseTool):
             self._fallback_entry_id = f"{self.name}_{digest}"
 
         config["entry_id"] = self._fallback_entry_id
+        self._entry_id = self._fallback_entry_id
 
         if not self._entry_id_warning_emitted:
             self._logger.warning(
@@ -557,24 +861,56 @@ class SantaWishlist(SimpleBaseTool):
 
         return self._fallback_entry_id
 
+    def _build_sql(self, table: str) -> SimpleNamespace:
+        """Bind the wishlist table into every statement once per instance."""
+
+        return SimpleNamespace(
+            insert_child=(
+                f"INSERT OR IGNORE INTO {self._table_children} "
+                "(child_hash, child_name, age, locale, entry_id) VALUES (?, ?, ?, ?, ?)"
+            ),
+            insert=f"INSERT INTO {table} (child_hash, wish, created_at) VALUES (?, ?, ?)",
+            child_wishes=(
+                f"SELECT wish, created_at, COUNT(*) OVER () AS total FROM {table} "
+                "WHERE child_hash = ? ORDER BY created_at DESC LIMIT ?"
+            ),
+            child_count=f"SELECT COUNT(*) FROM {table} WHERE child_hash = ?",
+            child_recent=(
+                f"SELECT wish, created_at FROM {table} "
+                "WHERE child_hash = ? ORDER BY created_at DESC LIMIT ?"
+            ),
+            trending=(
+                f"WITH recent AS (SELECT wish, child_hash, created_at FROM {table} WHERE created_at >= ?) "
+                "SELECT wish, COUNT(*) AS total, MAX(created_at) AS last_seen, "
+                "(SELECT COUNT(*) FROM recent) AS total_wishes, "
+                "(SELECT COUNT(DISTINCT child_hash) FROM recent) AS unique_children "
+                "FROM recent GROUP BY wish ORDER BY total DESC, last_seen DESC LIMIT 5"
+            ),
+            index_ddl=(
+                f"CREATE INDEX IF NOT EXISTS idx_{self.name}_child_created ON {table} "
+                "(child_hash, created_at DESC)",
+                f"CREATE INDEX IF NOT EXISTS idx_{self.name}_created_wish ON {table} "
+                "(created_at, wish, child_hash)",
+                f"DROP INDEX IF EXISTS idx_{self.name}_child_hash",
+                f"DROP INDEX IF EXISTS idx_{self.name}_wish",
+            ),
+        )
+
     def _table_name(self, suffix: str) -> str:
         return f"{self.name}_{suffix}"
 
     def _normalize_name(self, name: Optional[str]) -> Optional[str]:
         if not name:
             return None
-        cleaned = " ".join(part.capitalize() for part in name.split())
-        return cleaned.strip()
+        return _normalize_name_cached(name)
 
     def _sanitize_wish(self, wish: Optional[str]) -> Optional[str]:
         if not wish:
             return None
-        cleaned = " ".join(wish.strip().split())
-        return cleaned[:280]
+        return _WHITESPACE_RE.sub(" ", wish).strip()[:MAX_WISH_LENGTH]
 
     def _child_hash(self, name: str, age: Optional[int]) -> str:
-        base = f"{name.lower()}|{age if age is not None else ''}|{self.config.get('entry_id', '')}"
-        return hashlib.sha256(base.encode("utf-8")).hexdigest()
+        return _compute_child_hash(name.lower(), age, self._entry_id)
 
     def _format_child_name(self, name: str, age: Optional[int]) -> str:
         if age is None:
@@ -582,19 +918,21 @@ class SantaWishlist(SimpleBaseTool):
         return f"{name} ({age} yrs)"
 
     def _get_locale(self) -> str:
-        return getattr(self.hass.config, "language", "en") or "en"
+        if self._locale is None:
+            self._locale = getattr(self.hass.config, "language", "en") or "en"
+        return self._locale
 
     def _utc_now_iso(self) -> str:
-        return datetime.utcnow().replace(microsecond=0).isoformat() + "Z"
+        return _utc_iso_for_second(int(time.time()))
 
-    def _utc_iso_days_ago(self, days: int) -> str:
-        return (
-            datetime.utcnow().replace(microsecond=0) - timedelta(days=days)
-        ).isoformat() + "Z"
+    def _utc_iso_ago(self, delta: timedelta) -> str:
+        return _utc_iso_for_second(int(time.time()) - int(delta.total_seconds()))
 
     def _humanize_timestamp(self, value: Optional[str]) -> str:
         if not value:
             return "unknown time"
+        if len(value) >= 16 and value[4] == "-" and value[7] == "-" and value[10] == "T":
+            return value[:16].replace("T", " ")
         try:
             working_value = value[:-1] if value.endswith("Z") else value
             dt_obj = datetime.fromisoformat(working_value)
@@ -608,43 +946,28 @@ class SantaWishlist(SimpleBaseTool):
         *,
         required: bool,
     ) -> tuple[Optional[int], Optional[str]]:
-        if age in (None, ""):
+        parsed_age: Optional[int] = None
+
+        if type(age) is int:
+            parsed_age = age
+        elif age is None or (isinstance(age, str) and not age.strip()):
             if required:
                 return None, self._message(
                     "missing_age",
                     "Please provide the age to look up recorded wishes.",
                 )
             return None, None
-
-        parsed_age: Optional[int] = None
-
-        if isinstance(age, int):
-            parsed_age = age
-        elif isinstance(age, float) and age.is_integer():
-            parsed_age = int(age)
         elif isinstance(age, str):
             stripped = age.strip()
-            if not stripped:
-                if required:
-                    return None, self._message(
-                        "missing_age",
-                        "Please provide the age to look up recorded wishes.",
-                    )
-                return None, None
-            if stripped.isdigit():
+            if stripped.isdecimal():
                 parsed_age = int(stripped)
-            else:
-                return None, self._message(
-                    "invalid_age",
-                    "Age must be a whole number between 1 and 150.",
-                )
-        else:
-            return None, self._message(
-                "invalid_age",
-                "Age must be a whole number between 1 and 150.",
-            )
+        elif isinstance(age, float):
+            if age.is_integer():
+                parsed_age = int(age)
+        elif isinstance(age, int):
+            parsed_age = int(age)
 
-        if parsed_age is not None and not (MIN_ALLOWED_AGE <= parsed_age <= MAX_ALLOWED_AGE):
+        if parsed_age is None or not MIN_ALLOWED_AGE <= parsed_age <= MAX_ALLOWED_AGE:
             return None, self._message(
                 "invalid_age",
                 "Age must be a whole number between 1 and 150.",
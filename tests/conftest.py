@@ -1,7 +1,11 @@
+import asyncio
 import os
 import sys
 import types
 from dataclasses import dataclass, field
+from types import SimpleNamespace
+
+import pytest
 
 
 ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
@@ -150,10 +154,34 @@ class _Length:
         self.kwargs = kwargs
 
 
+class _Invalid(Exception):
+    """Stand-in for voluptuous.Invalid."""
+
+
 def _all(*_validators, **_kwargs):  # pragma: no cover - no runtime behaviour required
     return None
 
 
 voluptuous_module.All = _all
 voluptuous_module.Length = _Length
+voluptuous_module.Invalid = _Invalid
 sys.modules["voluptuous"] = voluptuous_module
+
+
+@pytest.fixture(scope="module")
+def event_loop_module():
+    """Share one event loop across a test module instead of one per asyncio.run call."""
+
+    if hasattr(asyncio, "Runner"):
+        with asyncio.Runner() as runner:
+            yield runner
+        return
+
+    loop = asyncio.new_event_loop()
+    yield SimpleNamespace(run=loop.run_until_complete)
+    loop.close()
+
+
+@pytest.fixture
+def run(event_loop_module):
+    return event_loop_module.run
@@ -1,24 +1,59 @@
 import asyncio
+import heapq
+import re
+import sqlite3
+import threading
+from collections import Counter
+from functools import lru_cache
 from types import SimpleNamespace
 
-from python.santa_wishlist import SantaWishlist
+import pytest
+import voluptuous as vol
+
+from custom_components.aurora_llm_assistant.tools.core.base_tool import SimpleBaseTool
+from custom_components.aurora_llm_assistant.tools.core.database_manager import DatabaseError
+from python.santa_wishlist import SantaWishlist, SantaWishlistSchema
 
 
 class DummyLogger:
+    """Record log calls unformatted; messages are rendered only when a test reads them."""
+
     def __init__(self):
-        self.messages = []
+        self.records = []
+        self._raw = {"debug": [], "info": [], "warning": [], "error": []}
+        self._formatted = {level: [] for level in self._raw}
+
+    @staticmethod
+    def _format(message, args):
+        return message % args if args else message
+
+    @property
+    def messages(self):
+        return [(level, self._format(message, args)) for level, message, args in self.records]
+
+    def messages_for(self, level):
+        """Return the formatted messages of one level, formatting only records added since the last call."""
+
+        raw = self._raw[level]
+        formatted = self._formatted[level]
+        formatted.extend(self._format(message, args) for message, args in raw[len(formatted):])
+        return formatted
+
+    def _log(self, level, message, args):
+        self.records.append((level, message, args))
+        self._raw[level].append((message, args))
 
     def debug(self, message, *args):
-        self.messages.append(("debug", message % args if args else message))
+        self._log("debug", message, args)
 
     def info(self, message, *args):
-        self.messages.append(("info", message % args if args else message))
+        self._log("info", message, args)
 
     def warning(self, message, *args):
-        self.messages.append(("warning", message % args if args else message))
+        self._log("warning", message, args)
 
     def error(self, message, *args):
-        self.messages.append(("error", message % args if args else message))
+        self._log("error", message, args)
 
 
 class DummyEventManager:
@@ -35,123 +70,684 @@ class DummyEventManager:
 
 class DummyConnection:
     def __init__(self):
-        self.entries = []
+        self.entry_hashes = []
+        self.entry_wishes = []
+        self.entry_created_at = []
+        self.entries_by_child = {}
+        self.children = {}
+        self.queries = []
+        self.table_created = False
+        self.window_query_error = None
+        self.trending_error = None
+
+    def reset(self):
+        """Forget all stored rows and recorded queries so the instance can back another test."""
+
+        self.entry_hashes.clear()
+        self.entry_wishes.clear()
+        self.entry_created_at.clear()
+        self.entries_by_child.clear()
+        self.children.clear()
+        self.queries.clear()
         self.table_created = False
+        self.window_query_error = None
+        self.trending_error = None
 
     def create_table(self, _name, _schema):
         self.table_created = True
 
     def execute_query(self, query, params):
-        text = " ".join(query.split()).lower()
-
-        if text.startswith("insert into"):
-            entry = {
-                "child_hash": params[0],
-                "child_name": params[1],
-                "age": params[2],
-                "wish": params[3],
-                "created_at": params[4],
-                "entry_id": params[5],
-                "locale": params[6],
-            }
-            self.entries.append(entry)
-            return {"lastrowid": len(self.entries)}
-
-        if "count(*)" in text and "where child_hash = ?" in text:
-            child_hash = params[0]
-            total = sum(1 for entry in self.entries if entry["child_hash"] == child_hash)
-            return {"data": [[total]]}
-
-        if text.startswith("select wish, created_at") and "limit 5" in text:
-            child_hash = params[0]
-            rows = [
-                (entry["wish"], entry["created_at"])
-                for entry in reversed(self.entries)
-                if entry["child_hash"] == child_hash
-            ][:5]
-            return {"data": rows}
-
-        if text.startswith("select wish, created_at"):
-            child_hash = params[0]
-            rows = [
-                (entry["wish"], entry["created_at"])
-                for entry in self.entries
-                if entry["child_hash"] == child_hash
+        self.queries.append(query)
+        handler = _dummy_query_handler(query)
+        if handler is None:
+            return {"data": []}
+        return getattr(self, handler)(params)
+
+    def _insert_child(self, params):
+        # (child_name, age, locale, entry_id), mirroring the children table columns.
+        self.children.setdefault(params[0], tuple(params[1:5]))
+        return {"lastrowid": len(self.children)}
+
+    def _insert_entry(self, params):
+        row = len(self.entry_hashes)
+        self.entry_hashes.append(params[0])
+        self.entry_wishes.append(params[1])
+        self.entry_created_at.append(params[2])
+        self.entries_by_child.setdefault(params[0], []).append(row)
+        return {"lastrowid": row + 1}
+
+    def _trending(self, _params):
+        if self.trending_error is not None:
+            raise self.trending_error
+        total_wishes = len(self.entry_hashes)
+        unique_children = len(self.entries_by_child)
+        totals = Counter()
+        last_seen = {}
+        for wish, created_at in zip(self.entry_wishes, self.entry_created_at):
+            totals[wish] += 1
+            if created_at > last_seen.get(wish, ""):
+                last_seen[wish] = created_at
+        ordered = heapq.nsmallest(
+            5, totals.items(), key=lambda item: (-item[1], last_seen[item[0]])
+        )
+        return {
+            "data": [
+                (wish, total, last_seen[wish], total_wishes, unique_children)
+                for wish, total in ordered
             ]
-            rows.sort(key=lambda value: value[1], reverse=True)
-            return {"data": rows}
-
-        if "count(*)" in text and "count(distinct child_hash)" in text:
-            return {
-                "data": [
-                    [len(self.entries), len({entry["child_hash"] for entry in self.entries})]
-                ]
-            }
-
-        if text.startswith("select wish, count(*)"):
-            wish_totals = {}
-            for entry in self.entries:
-                wish_totals.setdefault(entry["wish"], {"total": 0, "last_seen": entry["created_at"]})
-                wish_totals[entry["wish"]]["total"] += 1
-                wish_totals[entry["wish"]]["last_seen"] = max(
-                    wish_totals[entry["wish"]]["last_seen"], entry["created_at"]
-                )
-            ordered = sorted(
-                wish_totals.items(),
-                key=lambda item: (-item[1]["total"], item[1]["last_seen"]),
-            )[:5]
-            return {"data": [(wish, data["total"], data["last_seen"]) for wish, data in ordered]}
-
-        return {"data": []}
+        }
+
+    def _child_wishes(self, params):
+        if self.window_query_error is not None:
+            raise self.window_query_error
+        child_hash, limit = params
+        matching = self.entries_by_child.get(child_hash, [])
+        rows = [
+            (self.entry_wishes[row], self.entry_created_at[row], len(matching))
+            for row in matching[: -limit - 1 : -1]
+        ]
+        return {"data": rows}
+
+    def _child_count(self, params):
+        total = len(self.entries_by_child.get(params[0], ()))
+        return {"data": [[total]]}
+
+    def _child_recent(self, params):
+        child_hash, limit = params
+        rows = [
+            (self.entry_wishes[row], self.entry_created_at[row])
+            for row in self.entries_by_child.get(child_hash, [])[: -limit - 1 : -1]
+        ]
+        return {"data": rows}
+
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=32)
+def _dummy_query_handler(query):
+    """Resolve a query to its DummyConnection handler; the tool reuses a handful of SQL strings."""
+
+    text = _WHITESPACE_RE.sub(" ", query).strip().lower()
+    if text.startswith("insert or ignore into"):
+        return "_insert_child"
+    if text.startswith("insert into"):
+        return "_insert_entry"
+    if text.startswith("with recent as"):
+        return "_trending"
+    if "count(*) over ()" in text:
+        return "_child_wishes"
+    if "count(*)" in text and "where child_hash = ?" in text:
+        return "_child_count"
+    if text.startswith("select wish, created_at") and "limit ?" in text:
+        return "_child_recent"
+    return None
+
+
+class SqliteConnection:
+    """Thin adapter exposing a real SQLite database through the Aurora connection API."""
+
+    def __init__(self, path=":memory:", check_same_thread=False):
+        self.connection = sqlite3.connect(
+            path, check_same_thread=check_same_thread, isolation_level=None
+        )
+        self.closed = False
+
+    def close(self):
+        self.connection.close()
+        self.closed = True
+
+    def create_table(self, name, schema):
+        columns = ", ".join(f"{column} {definition}" for column, definition in schema.items())
+        self.connection.execute(f"CREATE TABLE IF NOT EXISTS santa_wishlist_{name} ({columns})")
+
+    def execute_query(self, query, params):
+        try:
+            cursor = self.connection.execute(query, params)
+        except sqlite3.Error as error:
+            raise DatabaseError(str(error)) from error
+        return {"data": [list(row) for row in cursor.fetchall()], "lastrowid": cursor.lastrowid}
+
+
+class AutoCommitSqliteConnection(SqliteConnection):
+    """Commit after every statement, like database managers that manage transactions themselves."""
+
+    def execute_query(self, query, params):
+        result = super().execute_query(query, params)
+        if self.connection.in_transaction:
+            self.connection.commit()
+        return result
 
 
 class DummyDatabaseManager:
-    def __init__(self):
-        self.connection = DummyConnection()
+    def __init__(self, connection=None):
+        self.connection = connection if connection is not None else DummyConnection()
 
     def get_connection(self, _name, _config, check_same_thread=True):  # noqa: ARG002 - signature compatibility
         return self.connection
 
 
 class DummyHass:
-    def __init__(self):
+    config = SimpleNamespace(language="en")
+    instance_id = "dummy-instance"
+
+    def __init__(self, connection=None):
         self.logger = DummyLogger()
         self.event_manager = DummyEventManager()
-        self.database_manager = DummyDatabaseManager()
-        self.config = SimpleNamespace(language="en")
-        self.instance_id = "dummy-instance"
+        self.database_manager = DummyDatabaseManager(connection)
+
+
+@pytest.fixture(scope="module")
+def shared_connection():
+    return DummyConnection()
+
 
+@pytest.fixture
+def dummy_connection(shared_connection):
+    shared_connection.reset()
+    return shared_connection
 
-def test_register_without_entry_id_uses_fallback_and_succeeds():
+
+@pytest.fixture
+def wishlist(dummy_connection):
+    hass = DummyHass(dummy_connection)
+    return SantaWishlist(hass, config={"entry_id": "entry"}), hass
+
+
+def test_register_without_entry_id_uses_fallback_and_succeeds(run):
     hass = DummyHass()
     tool = SantaWishlist(hass, config={})
 
-    result = asyncio.run(
+    result = run(
         tool.handle(action="register", name="Charlie", age=7, wish="A new sled")
     )
 
     assert result["status"] == "success"
     assert "ledger is unavailable" not in result["message"].lower()
     assert tool.config["entry_id"].startswith(tool.name)
-    warnings = [message for level, message in hass.logger.messages if level == "warning"]
+    warnings = hass.logger.messages_for("warning")
     assert any("entry_id missing" in message for message in warnings)
     assert hass.event_manager.errors == []
 
     # Ensure a second call does not emit another warning and reuses the fallback entry_id
-    asyncio.run(tool.handle(action="register", name="Charlie", age=7, wish="Warm mittens"))
-    warnings = [message for level, message in hass.logger.messages if level == "warning"]
+    run(tool.handle(action="register", name="Charlie", age=7, wish="Warm mittens"))
+    warnings = hass.logger.messages_for("warning")
     assert len(warnings) == 1
-    assert len(hass.database_manager.connection.entries) == 2
+    assert len(hass.database_manager.connection.entry_hashes) == 2
+
+
+def test_tool_accepts_base_tool_leaving_config_unset(monkeypatch, run):
+    base_init = SimpleBaseTool.__init__
 
+    def init_without_config(self, hass, config=None):
+        base_init(self, hass, config)
+        self.config = None
+
+    monkeypatch.setattr(SimpleBaseTool, "__init__", init_without_config)
+    tool = SantaWishlist(DummyHass(), config=None)
+
+    result = run(tool.handle(action="register", name="Charlie", age=7, wish="A new sled"))
+
+    assert result["status"] == "success"
+    assert tool.config["entry_id"].startswith(tool.name)
 
-def test_list_returns_entries_after_registering():
+
+def test_list_returns_entries_after_registering(run):
     hass = DummyHass()
     tool = SantaWishlist(hass, config={})
 
-    asyncio.run(tool.handle(action="register", name="Alex", age=8, wish="A telescope"))
-    result = asyncio.run(tool.handle(action="list", name="Alex", age=8))
+    run(tool.handle(action="register", name="Alex", age=8, wish="A telescope"))
+    result = run(tool.handle(action="list", name="Alex", age=8))
 
     assert result["status"] == "success"
     assert result["total"] == 1
     assert result["wishes"][0]["wish"] == "A telescope"
     assert "Alex" in result["message"]
+
+
+def test_connection_pragmas_are_applied_once(wishlist, run):
+    tool, hass = wishlist
+
+    run(tool.handle(action="register", name="Mia", age=6, wish="A puppy"))
+    run(tool.handle(action="list", name="Mia", age=6))
+
+    pragmas = [
+        query
+        for query in hass.database_manager.connection.queries
+        if query.startswith("PRAGMA") and "=" in query
+    ]
+    assert pragmas == [
+        "PRAGMA journal_mode=WAL",
+        "PRAGMA synchronous=NORMAL",
+        "PRAGMA busy_timeout=5000",
+        "PRAGMA temp_store=MEMORY",
+        "PRAGMA cache_size=-20000",
+        "PRAGMA mmap_size=268435456",
+    ]
+
+
+def test_register_reports_total_and_recent_wishes(wishlist, run):
+    tool, hass = wishlist
+
+    for wish in ("A kite", "A drum", "A bike"):
+        result = run(tool.handle(action="register", name="Noah", age=5, wish=wish))
+
+    assert result["total_for_child"] == 3
+    assert [entry["wish"] for entry in result["recent_wishes"]] == ["A bike", "A drum", "A kite"]
+
+
+def test_register_falls_back_without_window_functions(run):
+    hass = DummyHass()
+    hass.database_manager.connection.window_query_error = DatabaseError(
+        "no such function: count over"
+    )
+    tool = SantaWishlist(hass, config={"entry_id": "entry"})
+
+    run(tool.handle(action="register", name="Noah", age=5, wish="A kite"))
+    result = run(tool.handle(action="register", name="Noah", age=5, wish="A drum"))
+
+    assert result["status"] == "success"
+    assert result["total_for_child"] == 2
+    assert [entry["wish"] for entry in result["recent_wishes"]] == ["A drum", "A kite"]
+    assert hass.event_manager.errors == []
+
+
+def test_transient_window_query_error_keeps_window_functions(wishlist, run):
+    tool, hass = wishlist
+    connection = hass.database_manager.connection
+    connection.window_query_error = DatabaseError("database is locked")
+
+    failed = run(tool.handle(action="register", name="Noah", age=5, wish="A kite"))
+    connection.window_query_error = None
+    queries_before = len(connection.queries)
+    result = run(tool.handle(action="register", name="Noah", age=5, wish="A drum"))
+
+    assert failed["status"] == "error"
+    assert result["status"] == "success"
+    assert any("COUNT(*) OVER ()" in query for query in connection.queries[queries_before:])
+
+
+def test_trending_indexes_are_created(wishlist, run):
+    tool, hass = wishlist
+
+    run(tool.handle(action="trending"))
+
+    indexes = [
+        query for query in hass.database_manager.connection.queries if query.startswith("CREATE INDEX")
+    ]
+    assert any("(child_hash, created_at DESC)" in query for query in indexes)
+    assert any("(created_at, wish, child_hash)" in query for query in indexes)
+
+
+def test_trending_is_cached_until_a_new_wish_is_registered(wishlist, run):
+    tool, hass = wishlist
+    connection = hass.database_manager.connection
+
+    run(tool.handle(action="register", name="Liam", age=4, wish="A train set"))
+    first = run(tool.handle(action="trending"))
+    queries_after_first = len(connection.queries)
+    second = run(tool.handle(action="trending"))
+
+    assert second == first
+    assert len(connection.queries) == queries_after_first
+
+    second["trending"].clear()
+    run(tool.handle(action="register", name="Liam", age=4, wish="A train set"))
+    third = run(tool.handle(action="trending"))
+
+    assert third["trending"][0]["total"] == 2
+
+
+def test_humanize_timestamp_formats_stored_iso_values():
+    tool = SantaWishlist(DummyHass(), config={"entry_id": "entry"})
+
+    assert tool._humanize_timestamp("2025-12-24T18:30:05Z") == "2025-12-24 18:30"
+    assert tool._humanize_timestamp("2025-12-24 18:30") == "2025-12-24 18:30"
+    assert tool._humanize_timestamp("yesterday") == "yesterday"
+    assert tool._humanize_timestamp(None) == "unknown time"
+    assert tool._utc_now_iso().endswith("Z")
+
+
+def test_wish_field_validation_enforces_length():
+    validate = SantaWishlistSchema().fields["wish"].validation
+
+    assert validate("A sled") == "A sled"
+    for value in ("ab", "x" * 281, 42):
+        with pytest.raises(vol.Invalid):
+            validate(value)
+
+
+def test_name_and_wish_whitespace_is_collapsed():
+    tool = SantaWishlist(DummyHass(), config={"entry_id": "entry"})
+
+    assert tool._normalize_name("  anna-lisa \t svensson ") == "Anna-Lisa Svensson"
+    assert tool._normalize_name("   ") == ""
+    assert tool._sanitize_wish("  a  red\n\nbike  ") == "a red bike"
+    assert len(tool._sanitize_wish("x" * 400)) == 280
+
+
+def test_failed_trending_read_is_reported_and_not_cached(wishlist, run):
+    tool, hass = wishlist
+    connection = hass.database_manager.connection
+    run(tool.handle(action="register", name="Mia", age=6, wish="A puppy"))
+
+    connection.trending_error = DatabaseError("disk I/O error")
+    failed = run(tool.handle(action="trending"))
+    connection.trending_error = None
+    trending = run(tool.handle(action="trending"))
+
+    assert failed["status"] == "error"
+    assert hass.event_manager.errors == [("santa_wishlist", "disk I/O error", "trending")]
+    assert trending["status"] == "success"
+    assert trending["trending"][0]["wish"] == "A puppy"
+
+
+def test_failed_list_read_is_reported_as_an_error(wishlist, run):
+    tool, hass = wishlist
+    connection = hass.database_manager.connection
+    run(tool.handle(action="register", name="Mia", age=6, wish="A puppy"))
+
+    connection.window_query_error = DatabaseError("disk I/O error")
+    result = run(tool.handle(action="list", name="Mia", age=6))
+
+    assert result["status"] == "error"
+    assert "no wishes" not in result["message"].lower()
+    assert hass.event_manager.errors == [("santa_wishlist", "disk I/O error", "list")]
+
+
+def test_trending_reports_totals_from_a_single_query(wishlist, run):
+    tool, hass = wishlist
+
+    run(tool.handle(action="register", name="Saga", age=7, wish="A doll house"))
+    run(tool.handle(action="register", name="Elsa", age=9, wish="A doll house"))
+    run(tool.handle(action="register", name="Elsa", age=9, wish="Ice skates"))
+    queries_before = len(hass.database_manager.connection.queries)
+    result = run(tool.handle(action="trending"))
+
+    assert len(hass.database_manager.connection.queries) == queries_before + 1
+    assert result["trending"][0] == {
+        "wish": "A doll house",
+        "total": 2,
+        "last_seen": result["trending"][0]["last_seen"],
+    }
+    assert result["total_wishes"] == 3
+    assert result["unique_children"] == 2
+
+
+def test_list_caps_rows_but_reports_full_total(wishlist, run):
+    tool, hass = wishlist
+    for index in range(120):
+        run(tool.handle(action="register", name="Vera", age=8, wish=f"Gift {index}"))
+
+    result = run(tool.handle(action="list", name="Vera", age=8))
+
+    assert result["total"] == 120
+    assert len(result["wishes"]) == 100
+    assert result["wishes"][0]["wish"] == "Gift 119"
+    assert result["message"].count("\n") == 10
+
+
+def test_legacy_entries_are_migrated_to_children_table(run):
+    hass = DummyHass()
+    connection = SqliteConnection()
+    hass.database_manager.connection = connection
+    connection.connection.execute(
+        "CREATE TABLE santa_wishlist_wishlist_entries (id INTEGER PRIMARY KEY AUTOINCREMENT, "
+        "child_hash TEXT NOT NULL, child_name TEXT NOT NULL, age INTEGER, wish TEXT NOT NULL, "
+        "created_at TEXT NOT NULL, entry_id TEXT, locale TEXT)"
+    )
+    tool = SantaWishlist(hass, config={"entry_id": "entry"})
+    child_hash = tool._child_hash("Maja", 7)
+    connection.connection.execute(
+        "INSERT INTO santa_wishlist_wishlist_entries "
+        "(child_hash, child_name, age, wish, created_at, entry_id, locale) "
+        "VALUES (?, 'Maja', 7, 'A pony', '2025-12-01T10:00:00Z', 'entry', 'sv')",
+        [child_hash],
+    )
+
+    result = run(tool.handle(action="register", name="Maja", age=7, wish="A saddle"))
+
+    assert result["total_for_child"] == 2
+    assert [entry["wish"] for entry in result["recent_wishes"]] == ["A saddle", "A pony"]
+    children = connection.connection.execute(
+        "SELECT child_hash, child_name, age, locale, entry_id FROM santa_wishlist_children"
+    ).fetchall()
+    assert children == [(child_hash, "Maja", 7, "sv", "entry")]
+    columns = [
+        row[1]
+        for row in connection.connection.execute(
+            "PRAGMA table_info(santa_wishlist_wishlist_entries)"
+        ).fetchall()
+    ]
+    assert columns == ["id", "child_hash", "wish", "created_at"]
+
+
+class FailOnceConnection(AutoCommitSqliteConnection):
+    """Auto-committing connection that fails the first statement starting with ``fail_prefix``."""
+
+    def __init__(self, fail_prefix):
+        super().__init__()
+        self.fail_prefix = fail_prefix
+
+    def execute_query(self, query, params):
+        if self.fail_prefix and query.startswith(self.fail_prefix):
+            self.fail_prefix = None
+            raise DatabaseError("disk I/O error")
+        return super().execute_query(query, params)
+
+
+@pytest.mark.parametrize(
+    "fail_prefix",
+    [
+        "ALTER TABLE santa_wishlist_wishlist_entries",
+        "INSERT OR IGNORE INTO santa_wishlist_children",
+        "INSERT OR IGNORE INTO santa_wishlist_wishlist_entries",
+        "DROP TABLE santa_wishlist_wishlist_entries_legacy",
+    ],
+)
+def test_interrupted_legacy_migration_resumes_on_next_start(fail_prefix, run):
+    connection = FailOnceConnection(fail_prefix)
+    hass = DummyHass(connection)
+    connection.connection.execute(
+        "CREATE TABLE santa_wishlist_wishlist_entries (id INTEGER PRIMARY KEY AUTOINCREMENT, "
+        "child_hash TEXT NOT NULL, child_name TEXT NOT NULL, age INTEGER, wish TEXT NOT NULL, "
+        "created_at TEXT NOT NULL, entry_id TEXT, locale TEXT)"
+    )
+    tool = SantaWishlist(hass, config={"entry_id": "entry"})
+    child_hash = tool._child_hash("Maja", 7)
+    connection.connection.execute(
+        "INSERT INTO santa_wishlist_wishlist_entries "
+        "(child_hash, child_name, age, wish, created_at, entry_id, locale) "
+        "VALUES (?, 'Maja', 7, 'A pony', '2025-12-01T10:00:00Z', 'entry', 'sv')",
+        [child_hash],
+    )
+
+    failed = run(tool.handle(action="list", name="Maja", age=7))
+    listed = run(tool.handle(action="list", name="Maja", age=7))
+
+    assert failed["status"] == "error"
+    assert listed["total"] == 1
+    assert listed["wishes"][0]["wish"] == "A pony"
+    tables = {
+        row[0]
+        for row in connection.connection.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table'"
+        ).fetchall()
+    }
+    assert "santa_wishlist_wishlist_entries_legacy" not in tables
+
+
+def test_unavailable_ledger_is_reported_once_per_action(run):
+    hass = DummyHass()
+
+    def failing_get_connection(_name, _config, check_same_thread=True):  # noqa: ARG001
+        raise DatabaseError("disk I/O error")
+
+    hass.database_manager.get_connection = failing_get_connection
+    tool = SantaWishlist(hass, config={"entry_id": "entry"})
+
+    for kwargs in (
+        {"action": "register", "name": "Ida", "wish": "A book"},
+        {"action": "list", "name": "Ida", "age": 5},
+        {"action": "trending"},
+    ):
+        result = run(tool.handle(**kwargs))
+        assert result["status"] == "error"
+        assert "unavailable" in result["message"]
+
+    assert [error[2] for error in hass.event_manager.errors] == ["ensure_connection"] * 3
+    assert run(tool.handle(action="unknown"))["message"].startswith("Unknown action")
+
+
+def test_register_succeeds_when_connection_auto_commits(run):
+    connection = AutoCommitSqliteConnection()
+    hass = DummyHass(connection)
+    tool = SantaWishlist(hass, config={"entry_id": "entry"})
+
+    result = run(tool.handle(action="register", name="Ida", age=8, wish="A telescope"))
+    listed = run(tool.handle(action="list", name="Ida", age=8))
+
+    assert result["status"] == "success"
+    assert result["total_for_child"] == 1
+    assert listed["total"] == 1
+    assert hass.event_manager.errors == []
+
+
+def test_register_runs_insert_and_reads_in_one_transaction(wishlist, run):
+    tool, hass = wishlist
+    connection = hass.database_manager.connection
+
+    run(tool.handle(action="trending"))
+    queries_before = len(connection.queries)
+    run(tool.handle(action="register", name="Theo", age=3, wish="A rocking horse"))
+
+    register_queries = connection.queries[queries_before:]
+    assert register_queries[0] == "BEGIN IMMEDIATE"
+    assert register_queries[-1] == "COMMIT"
+    assert len(register_queries) == 5
+
+
+def test_reads_use_dedicated_reader_connections(tmp_path, run):
+    hass = DummyHass()
+    path = str(tmp_path / "wishlist.db")
+    opened = []
+
+    def open_connection(_name, _config, check_same_thread=True):  # noqa: ARG001
+        opened.append(SqliteConnection(path))
+        return opened[-1]
+
+    hass.database_manager.get_connection = open_connection
+    tool = SantaWishlist(hass, config={"entry_id": "entry"})
+
+    run(tool.handle(action="register", name="Nils", age=10, wish="A chemistry set"))
+    listed = run(tool.handle(action="list", name="Nils", age=10))
+    trending = run(tool.handle(action="trending"))
+    tool.on_unload()
+
+    assert len(opened) == 3
+    assert listed["total"] == 1
+    assert trending["trending"][0]["wish"] == "A chemistry set"
+    journal_mode = opened[0].connection.execute("PRAGMA journal_mode").fetchone()[0]
+    assert journal_mode == "wal"
+    assert [connection.closed for connection in opened] == [False, True, True]
+
+
+def test_unload_closes_reader_connections_held_by_running_reads(tmp_path, run):
+    hass = DummyHass()
+    path = str(tmp_path / "wishlist.db")
+    opened = []
+    release = threading.Event()
+
+    class GatedSqliteConnection(SqliteConnection):
+        gated = False
+
+        def execute_query(self, query, params):
+            if self.gated:
+                release.wait(timeout=5)
+            return super().execute_query(query, params)
+
+    def open_connection(_name, _config, check_same_thread=True):  # noqa: ARG001
+        opened.append(GatedSqliteConnection(path))
+        return opened[-1]
+
+    hass.database_manager.get_connection = open_connection
+    tool = SantaWishlist(hass, config={"entry_id": "entry"})
+    run(tool.handle(action="register", name="Nils", age=10, wish="A chemistry set"))
+    for reader in opened[1:]:
+        reader.gated = True
+
+    async def list_during_unload():
+        reads = [
+            asyncio.ensure_future(tool.handle(action="list", name="Nils", age=10))
+            for _ in range(6)
+        ]
+        await asyncio.sleep(0.05)
+        tool.on_unload()
+        release.set()
+        return await asyncio.gather(*reads)
+
+    results = run(list_during_unload())
+
+    assert all(result["status"] in ("success", "error") for result in results)
+    assert [connection.closed for connection in opened[1:]] == [True, True]
+
+
+def test_reads_stay_on_writer_when_manager_rejects_check_same_thread(tmp_path, run):
+    hass = DummyHass()
+    path = str(tmp_path / "wishlist.db")
+    opened = []
+
+    def open_connection(_name, _config):
+        opened.append(SqliteConnection(path, check_same_thread=True))
+        return opened[-1]
+
+    hass.database_manager.get_connection = open_connection
+    tool = SantaWishlist(hass, config={"entry_id": "entry"})
+
+    run(tool.handle(action="register", name="Nils", age=10, wish="A chemistry set"))
+    listed = run(tool.handle(action="list", name="Nils", age=10))
+    trending = run(tool.handle(action="trending"))
+    tool.on_unload()
+
+    assert len(opened) == 1
+    assert listed["total"] == 1
+    assert trending["trending"][0]["wish"] == "A chemistry set"
+
+
+def test_validate_age_accepts_whole_numbers_in_range():
+    tool = SantaWishlist(DummyHass(), config={"entry_id": "entry"})
+
+    assert tool._validate_age(7, required=True) == (7, None)
+    assert tool._validate_age(" 12 ", required=True) == (12, None)
+    assert tool._validate_age(9.0, required=True) == (9, None)
+    assert tool._validate_age("", required=False) == (None, None)
+    assert tool._validate_age(None, required=True)[1].startswith("Please provide the age")
+    for value in (0, 151, "seven", "²", 7.5, [7]):
+        assert tool._validate_age(value, required=True) == (
+            None,
+            "Age must be a whole number between 1 and 150.",
+        )
+
+
+def test_tool_keeps_working_after_unload(wishlist, run):
+    tool, hass = wishlist
+    retired_finalizers = tool._executor_finalizers
+
+    run(tool.handle(action="register", name="Alva", age=6, wish="A paint box"))
+    tool.on_unload()
+    result = run(tool.handle(action="list", name="Alva", age=6))
+
+    assert result["status"] == "success"
+    assert result["total"] == 1
+    assert not any(finalizer.alive for finalizer in retired_finalizers)
+    assert all(finalizer.alive for finalizer in tool._executor_finalizers)
+
+
+def test_schema_registers_fields_and_actions():
+    schema = SantaWishlistSchema()
+
+    assert list(schema.fields) == ["action", "name", "age", "wish"]
+    assert list(schema.actions) == ["register", "list", "trending"]
+    action_options = schema.fields["action"].widget_options
+    assert action_options["trigger_update"] is True
+    assert [option["value"] for option in action_options["options"]] == ["register", "list", "trending"]